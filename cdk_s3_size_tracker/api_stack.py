@@ -0,0 +1,62 @@
+from aws_cdk import (
+    Stack,
+    Duration,
+    aws_s3 as s3,
+    aws_dynamodb as dynamodb,
+    aws_lambda as _lambda,
+    aws_apigateway as apigw,
+    CfnOutput,
+)
+from constructs import Construct
+
+
+class ApiStack(Stack):
+    def __init__(
+        self,
+        scope: Construct,
+        construct_id: str,
+        *,
+        bucket: s3.IBucket,
+        table: dynamodb.ITable,
+        plotting_alias: _lambda.IFunction,
+        **kwargs
+    ) -> None:
+        super().__init__(scope, construct_id, **kwargs)
+
+        # Create the REST API for the plotting lambda
+        api = apigw.RestApi(
+            self,
+            "PlottingApi",
+            rest_api_name="S3-Size-Plotting-API",
+            description="API for triggering the plotting lambda",
+        )
+
+        # The driver lives here rather than in the compute stack because it
+        # needs the API URL, and the API needs the plotting alias
+        # Update driver lambda with new test sequence and longer timeout
+        self.driver_lambda = _lambda.Function(
+            self,
+            "DriverLambda",
+            runtime=_lambda.Runtime.PYTHON_3_12,
+            architecture=_lambda.Architecture.ARM_64,
+            handler="driver_lambda.handler",
+            code=_lambda.Code.from_asset("lambda/driver"),
+            timeout=Duration.minutes(6),  # Covers two cleanup waits of up to 150 seconds each
+            environment={
+                "TABLE_NAME": table.table_name,
+                "BUCKET_NAME": bucket.bucket_name,
+                "API_URL": f"{api.url}plot"
+            },
+        )
+        
+        # Grant the driver lambda permissions to access S3 and read size rows
+        bucket.grant_read_write(self.driver_lambda)
+        table.grant_read_data(self.driver_lambda)
+        
+        # Add a resource and method to the API
+        plot_resource = api.root.add_resource("plot")
+        plot_integration = apigw.LambdaIntegration(plotting_alias)
+        plot_resource.add_method("GET", plot_integration)
+
+        # Outputs
+        CfnOutput(self, "ApiUrl", value=api.url)
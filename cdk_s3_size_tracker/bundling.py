@@ -0,0 +1,77 @@
+import shutil
+import subprocess
+import sys
+
+import jsii
+from aws_cdk import (
+    BundlingOptions,
+    ILocalBundling,
+    aws_lambda as _lambda,
+)
+
+
+@jsii.implements(ILocalBundling)
+class PipLocalBundling:
+    """
+    Install an asset's requirements with the local pip, fetching wheels built for
+    the Lambda platform, so synth does not need Docker. Returns False (and CDK falls
+    back to the Docker bundling image) if pip cannot resolve them.
+    """
+
+    def __init__(self, asset_path: str, platforms: list, python_version: str) -> None:
+        self.asset_path = asset_path
+        self.platforms = platforms
+        self.python_version = python_version
+
+    def try_bundle(self, output_dir: str, options: BundlingOptions) -> bool:
+        command = [
+            sys.executable, "-m", "pip", "install",
+            "--quiet",
+            "--requirement", f"{self.asset_path}/requirements.txt",
+            "--target", output_dir,
+            "--python-version", self.python_version,
+            "--only-binary=:all:",
+        ]
+        for platform in self.platforms:
+            command += ["--platform", platform]
+
+        try:
+            subprocess.run(command, check=True)
+        except (OSError, subprocess.CalledProcessError):
+            return False
+
+        shutil.copytree(
+            self.asset_path,
+            output_dir,
+            dirs_exist_ok=True,
+            ignore=shutil.ignore_patterns("__pycache__"),
+        )
+        return True
+
+
+def python_asset(
+    asset_path: str,
+    runtime: _lambda.Runtime,
+    architecture: _lambda.Architecture,
+) -> _lambda.Code:
+    """
+    Lambda code from a directory with its requirements.txt installed alongside the handler.
+    """
+    machine = "aarch64" if architecture.name == _lambda.Architecture.ARM_64.name else "x86_64"
+
+    return _lambda.Code.from_asset(
+        asset_path,
+        bundling=BundlingOptions(
+            image=runtime.bundling_image,
+            platform=architecture.docker_platform,
+            command=[
+                "bash", "-c",
+                "pip install --requirement requirements.txt --target /asset-output && cp -au . /asset-output",
+            ],
+            local=PipLocalBundling(
+                asset_path,
+                [f"manylinux2014_{machine}", f"manylinux_2_28_{machine}"],
+                runtime.name.replace("python", ""),
+            ),
+        ),
+    )
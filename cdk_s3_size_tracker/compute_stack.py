@@ -0,0 +1,238 @@
+from aws_cdk import (
+    Stack,
+    RemovalPolicy,
+    Duration,
+    aws_s3 as s3,
+    aws_dynamodb as dynamodb,
+    aws_lambda as _lambda,
+    aws_sqs as sqs,
+    aws_lambda_event_sources as lambda_event_sources,
+    aws_logs as logs,
+    aws_cloudwatch as cloudwatch,
+    aws_cloudwatch_actions as cloudwatch_actions,
+    aws_iam as iam,
+    aws_events as events,
+    aws_events_targets as targets,
+)
+from constructs import Construct
+
+from cdk_s3_size_tracker.bundling import python_asset
+
+
+class ComputeStack(Stack):
+    def __init__(
+        self,
+        scope: Construct,
+        construct_id: str,
+        *,
+        bucket: s3.IBucket,
+        table: dynamodb.ITable,
+        size_tracking_queue: sqs.IQueue,
+        logging_queue: sqs.IQueue,
+        **kwargs
+    ) -> None:
+        super().__init__(scope, construct_id, **kwargs)
+
+        # Only deliver S3 events for our bucket so the handlers never parse records they would skip
+        s3_event_filter = _lambda.FilterCriteria.filter({
+            "body": {
+                "source": _lambda.FilterRule.is_equal("aws.s3"),
+                "detail": {
+                    "bucket": {
+                        "name": _lambda.FilterRule.is_equal(bucket.bucket_name)
+                    }
+                }
+            }
+        })
+
+        # Create the size-tracking lambda (updated to consume from SQS)
+        self.size_tracking_lambda = _lambda.Function(
+            self,
+            "SizeTrackingLambda",
+            runtime=_lambda.Runtime.PYTHON_3_12,
+            architecture=_lambda.Architecture.ARM_64,
+            handler="size_tracking_lambda.handler",
+            code=_lambda.Code.from_asset("lambda/size_tracking"),
+            timeout=Duration.seconds(30),
+            memory_size=512,
+            environment={
+                "TABLE_NAME": table.table_name,
+                "BUCKET_NAME": bucket.bucket_name,
+                # Seed running totals by listing; 'cloudwatch' or 'inventory' suit huge buckets
+                "SIZE_SOURCE": "list",
+            },
+        )
+        
+        # NEW - Add SQS as event source for size-tracking lambda
+        self.size_tracking_lambda.add_event_source(
+            lambda_event_sources.SqsEventSource(
+                size_tracking_queue,
+                batch_size=100,
+                max_batching_window=Duration.seconds(5),
+                report_batch_item_failures=True,
+                filters=[s3_event_filter],
+            )
+        )
+        
+        # Grant the lambda permissions to access S3 and DynamoDB
+        bucket.grant_read(self.size_tracking_lambda)
+        table.grant_read_write_data(self.size_tracking_lambda)
+        self.size_tracking_lambda.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=["cloudwatch:GetMetricStatistics"],
+                resources=["*"]
+            )
+        )
+        
+        # Running totals and the size index are updated by deltas; re-list the bucket daily to correct drift
+        self.reconcile_lambda = _lambda.Function(
+            self,
+            "ReconcileLambda",
+            runtime=_lambda.Runtime.PYTHON_3_12,
+            architecture=_lambda.Architecture.ARM_64,
+            handler="size_tracking_lambda.reconcile_handler",
+            code=_lambda.Code.from_asset("lambda/size_tracking"),
+            timeout=Duration.minutes(15),
+            memory_size=512,
+            environment={
+                "TABLE_NAME": table.table_name,
+                "BUCKET_NAME": bucket.bucket_name,
+            },
+        )
+        bucket.grant_read(self.reconcile_lambda)
+        table.grant_read_write_data(self.reconcile_lambda)
+        
+        events.Rule(
+            self,
+            "ReconcileSchedule",
+            schedule=events.Schedule.rate(Duration.days(1)),
+            targets=[targets.LambdaFunction(self.reconcile_lambda)],
+        )
+        
+        # NEW - Create the logging lambda
+        self.logging_lambda = _lambda.Function(
+            self,
+            "LoggingLambda",
+            runtime=_lambda.Runtime.PYTHON_3_12,
+            architecture=_lambda.Architecture.ARM_64,
+            handler="logging_lambda.handler",
+            code=_lambda.Code.from_asset("lambda/logging"),
+            timeout=Duration.seconds(30),
+            memory_size=512,
+            environment={
+                "TABLE_NAME": table.table_name,
+                "BUCKET_NAME": bucket.bucket_name,
+                "PUBLISH_METRICS": "true"
+            },
+        )
+        
+        # NEW - Add SQS as event source for logging lambda
+        self.logging_lambda.add_event_source(
+            lambda_event_sources.SqsEventSource(
+                logging_queue,
+                batch_size=100,
+                max_batching_window=Duration.seconds(5),
+                report_batch_item_failures=True,
+                filters=[s3_event_filter],
+            )
+        )
+        
+        # The logging lambda remembers object sizes so deletions can be logged
+        table.grant_read_write_data(self.logging_lambda)
+        
+        # Give the logging Lambda permission to publish metrics (ListMetrics warms the client)
+        self.logging_lambda.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=["cloudwatch:PutMetricData", "cloudwatch:ListMetrics"],
+                resources=["*"]
+            )
+        )
+        
+        # NEW - Create log group for logging lambda
+        self.log_group = logs.LogGroup(
+            self, 
+            "LoggingLambdaLogGroup",
+            log_group_name=f"/aws/lambda/{self.logging_lambda.function_name}",
+            retention=logs.RetentionDays.ONE_WEEK,
+            removal_policy=RemovalPolicy.DESTROY
+        )
+
+        # NEW - Create alarm for total object size
+        self.size_alarm = cloudwatch.Alarm(
+            self, 
+            "TotalObjectSizeAlarm",
+            metric=cloudwatch.Metric(
+                namespace="Assignment4App",
+                metric_name="TotalObjectSize",
+                statistic="Sum",
+                period=Duration.minutes(1)  # Adjust based on testing
+            ),
+            threshold=20,
+            # The metric is the per-minute sum of size deltas, not the bucket's level,
+            # so a single breaching minute has to be enough. Alarm actions only run on
+            # the transition into ALARM, so a sustained breach does not re-invoke the cleaner.
+            evaluation_periods=1,
+            datapoints_to_alarm=1,
+            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
+            comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD
+        )
+
+        # NEW - Cleaner Lambda
+        self.cleaner_lambda = _lambda.Function(
+            self,
+            "CleanerLambda",
+            runtime=_lambda.Runtime.PYTHON_3_12,
+            architecture=_lambda.Architecture.ARM_64,
+            code=_lambda.Code.from_asset("lambda/cleaner"),
+            handler="cleaner_lambda.handler",
+            environment={
+                "TABLE_NAME": table.table_name,
+                "BUCKET_NAME": bucket.bucket_name
+            },
+            timeout=Duration.seconds(30),
+            memory_size=512
+        )
+        
+        # Grant permissions
+        bucket.grant_read_write(self.cleaner_lambda)
+        table.grant_read_data(self.cleaner_lambda)
+        
+        # NEW - Configure alarm to trigger cleaner lambda
+        self.size_alarm.add_alarm_action(
+            cloudwatch_actions.LambdaAction(self.cleaner_lambda)
+        )
+        
+        # Create the plotting lambda
+        self.plotting_lambda = _lambda.Function(
+            self,
+            "PlottingLambda",
+            runtime=_lambda.Runtime.PYTHON_3_12,
+            architecture=_lambda.Architecture.ARM_64,
+            handler="plotting_lambda.handler",
+            # Pillow from requirements.txt is bundled into the asset for the function's platform
+            code=python_asset(
+                "lambda/plotting",
+                _lambda.Runtime.PYTHON_3_12,
+                _lambda.Architecture.ARM_64,
+            ),
+            timeout=Duration.seconds(60),
+            memory_size=1024,  # More memory for image rendering
+            environment={
+                "TABLE_NAME": table.table_name,
+                "BUCKET_NAME": bucket.bucket_name,
+            },
+        )
+        
+        # Keep one warm instance behind an alias so API calls skip the cold start
+        self.plotting_alias = _lambda.Alias(
+            self,
+            "PlottingAlias",
+            alias_name="live",
+            version=self.plotting_lambda.current_version,
+            provisioned_concurrent_executions=1,
+        )
+        
+        # Grant the plotting lambda permissions to access DynamoDB and S3
+        # (read is needed for the pre-signed plot URL it hands out)
+        table.grant_read_data(self.plotting_lambda)
+        bucket.grant_read_write(self.plotting_lambda)
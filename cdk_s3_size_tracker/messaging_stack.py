@@ -0,0 +1,75 @@
+from aws_cdk import (
+    Stack,
+    Duration,
+    aws_s3 as s3,
+    aws_sqs as sqs,
+    aws_events as events,
+    aws_events_targets as targets,
+)
+from constructs import Construct
+
+
+class MessagingStack(Stack):
+    def __init__(self, scope: Construct, construct_id: str, *, bucket: s3.IBucket, **kwargs) -> None:
+        super().__init__(scope, construct_id, **kwargs)
+
+        # Dead-letter queues so poison messages stop being retried after 3 attempts
+        self.size_tracking_dlq = sqs.Queue(
+            self,
+            "SizeTrackingDLQ",
+            retention_period=Duration.days(14)
+        )
+        
+        self.logging_dlq = sqs.Queue(
+            self,
+            "LoggingDLQ",
+            retention_period=Duration.days(14)
+        )
+        
+        # NEW - SQS Queues for consumers
+        self.size_tracking_queue = sqs.Queue(
+            self, 
+            "SizeTrackingQueue",
+            visibility_timeout=Duration.seconds(300),
+            receive_message_wait_time=Duration.seconds(20),
+            dead_letter_queue=sqs.DeadLetterQueue(
+                max_receive_count=3,
+                queue=self.size_tracking_dlq
+            )
+        )
+        
+        self.logging_queue = sqs.Queue(
+            self, 
+            "LoggingQueue",
+            visibility_timeout=Duration.seconds(300),
+            receive_message_wait_time=Duration.seconds(20),
+            dead_letter_queue=sqs.DeadLetterQueue(
+                max_receive_count=3,
+                queue=self.logging_dlq
+            )
+        )
+        
+        # Route the bucket's EventBridge notifications straight to each consumer
+        # queue, filtered server-side to object created/deleted events
+        s3_object_events = events.EventPattern(
+            source=["aws.s3"],
+            detail_type=["Object Created", "Object Deleted"],
+            detail={
+                "bucket": {
+                    "name": [bucket.bucket_name]
+                }
+            }
+        )
+        
+        events.Rule(
+            self,
+            "SizeTrackingRule",
+            event_pattern=s3_object_events,
+            targets=[targets.SqsQueue(self.size_tracking_queue)]
+        )
+        events.Rule(
+            self,
+            "LoggingRule",
+            event_pattern=s3_object_events,
+            targets=[targets.SqsQueue(self.logging_queue)]
+        )
@@ -0,0 +1,58 @@
+from aws_cdk import (
+    Stack,
+    RemovalPolicy,
+    aws_s3 as s3,
+    aws_dynamodb as dynamodb,
+    CfnOutput,
+)
+from constructs import Construct
+
+
+class StorageStack(Stack):
+    def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
+        super().__init__(scope, construct_id, **kwargs)
+
+        # Create the S3 bucket
+        self.bucket = s3.Bucket(
+            self,
+            "TestBucket",
+            removal_policy=RemovalPolicy.DESTROY,
+            auto_delete_objects=True,
+            event_bridge_enabled=True,
+        )
+
+        # Create the DynamoDB table for tracking S3 object size history
+        self.table = dynamodb.Table(
+            self,
+            "S3ObjectSizeHistory",
+            partition_key=dynamodb.Attribute(
+                name="bucketName",
+                type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name="timestamp",
+                type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=RemovalPolicy.DESTROY,
+        )
+
+        # Sparse index over the per-object size rows so the cleaner can find
+        # the largest object without listing the bucket
+        self.table.add_global_secondary_index(
+            index_name="SizeIndex",
+            partition_key=dynamodb.Attribute(
+                name="bucketName",
+                type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name="size",
+                type=dynamodb.AttributeType.NUMBER
+            ),
+            projection_type=dynamodb.ProjectionType.INCLUDE,
+            non_key_attributes=["objectKey"],
+        )
+
+        # Outputs
+        CfnOutput(self, "BucketName", value=self.bucket.bucket_name)
+        CfnOutput(self, "TableName", value=self.table.table_name)
@@ -1,35 +1,50 @@
 import json
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from boto3.dynamodb.conditions import Key
 import os
 import logging
+from operator import attrgetter
 
-# Initialize AWS services
-s3 = boto3.client('s3')
+# Initialize AWS services once per container so warm invocations reuse the connection
+client_config = Config(
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 3},
+    max_pool_connections=10,
+    connect_timeout=2,
+    read_timeout=5
+)
+s3 = boto3.resource('s3', config=client_config)
+dynamodb = boto3.resource('dynamodb', config=client_config)
 
 # Get environment variables
+TABLE_NAME = os.environ['TABLE_NAME']
 BUCKET_NAME = os.environ['BUCKET_NAME']
+table = dynamodb.Table(TABLE_NAME)
+bucket = s3.Bucket(BUCKET_NAME)
+
+# Index entries checked per query page before falling back to a listing
+INDEX_PAGE_SIZE = 10
 
 # Initialize logger
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
 
 def handler(event, context):
     """
     Delete the largest object in the S3 bucket when triggered by a CloudWatch alarm.
     This function is triggered when the TotalObjectSize metric exceeds the threshold.
     """
-    logger.info(f"Received event: {json.dumps(event)}")
+    logger.debug("Received event: %s", event)
     
     try:
         # Find the largest object in the bucket
-        largest_object = find_largest_object(BUCKET_NAME)
+        largest_object = find_largest_object(bucket)
         
         if largest_object:
             # Delete the largest object
-            s3.delete_object(
-                Bucket=BUCKET_NAME,
-                Key=largest_object['Key']
-            )
+            bucket.Object(largest_object['Key']).delete()
             
             logger.info(f"Deleted largest object: {largest_object['Key']} with size {largest_object['Size']} bytes")
             return {
@@ -46,34 +61,89 @@ def handler(event, context):
         logger.error(f"Error cleaning bucket: {e}")
         raise
 
-def find_largest_object(bucket_name):
+def find_largest_object(bucket):
     """
-    Find the largest object in the given S3 bucket.
+    Find the largest object in the given S3 bucket resource.
+    
+    Walks the SizeIndex GSI maintained by the size-tracking lambda from the
+    largest entry down, and returns the first one that still exists in S3:
+    SQS does not preserve order, so a delete handled before its create can
+    leave a row for an object that is gone. Only falls back to listing the
+    bucket when the index has no live entries. Objects whose events never
+    reached the size tracker are missing from the index until the daily
+    reconcile job resyncs it from a full listing.
     
     Returns:
         dict: A dictionary containing the Key and Size of the largest object,
               or None if the bucket is empty.
     """
     try:
-        # List all objects in the bucket
-        response = s3.list_objects_v2(Bucket=bucket_name)
+        query_args = {
+            'IndexName': 'SizeIndex',
+            'KeyConditionExpression': Key('bucketName').eq(bucket.name),
+            'ScanIndexForward': False,
+            'Limit': INDEX_PAGE_SIZE
+        }
         
-        if 'Contents' not in response:
-            return None
+        while True:
+            response = table.query(**query_args)
+            
+            for item in response['Items']:
+                size = get_object_size(bucket, item['objectKey'])
+                if size is not None:
+                    return {
+                        'Key': item['objectKey'],
+                        'Size': size
+                    }
+                logger.info(f"Skipping index entry for missing object {item['objectKey']}")
+            
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
         
-        # Find the largest object
-        largest_object = None
-        largest_size = 0
+        logger.info(f"Size index has no live objects for bucket {bucket.name}, listing objects instead")
+        return scan_largest_object(bucket)
+    except Exception as e:
+        logger.error(f"Error finding largest object: {e}")
+        raise
+
+def get_object_size(bucket, key):
+    """
+    HEAD the object to confirm it still exists.
+    
+    Returns:
+        int: The object's current size, or None if it no longer exists.
+    """
+    try:
+        return s3.meta.client.head_object(Bucket=bucket.name, Key=key)['ContentLength']
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+            return None
+        raise
+
+def scan_largest_object(bucket):
+    """
+    Find the largest object by listing every object in the bucket.
+    
+    Returns:
+        dict: A dictionary containing the Key and Size of the largest object,
+              or None if the bucket is empty.
+    """
+    try:
+        # The objects collection pages through the listing lazily, so only the running maximum is kept
+        largest_object = max(
+            bucket.objects.page_size(1000),
+            key=attrgetter('size'),
+            default=None
+        )
         
-        for obj in response['Contents']:
-            if obj['Size'] > largest_size:
-                largest_size = obj['Size']
-                largest_object = {
-                    'Key': obj['Key'],
-                    'Size': obj['Size']
-                }
+        if largest_object is None:
+            return None
         
-        return largest_object
+        return {
+            'Key': largest_object.key,
+            'Size': largest_object.size
+        }
     except Exception as e:
         logger.error(f"Error finding largest object: {e}")
-        raise
\ No newline at end of file
+        raise
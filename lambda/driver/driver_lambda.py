@@ -1,20 +1,43 @@
 import json
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from boto3.dynamodb.conditions import Key
 import os
 import time
-import urllib.request
+import datetime
+import urllib3
 import logging
 
-# Initialize AWS services
-s3 = boto3.client('s3')
+# Initialize AWS services once per container so warm invocations reuse the connection
+client_config = Config(
+    tcp_keepalive=True,
+    retries={'mode': 'standard', 'max_attempts': 2},
+    max_pool_connections=50
+)
+s3 = boto3.client('s3', config=client_config)
+# Module-level pool keeps the API Gateway connection alive across warm invocations
+http = urllib3.PoolManager(
+    num_pools=2,
+    maxsize=4,
+    retries=urllib3.Retry(3, status_forcelist=[500, 502, 503, 504]),
+    timeout=urllib3.Timeout(total=10)
+)
+dynamodb = boto3.resource('dynamodb', config=client_config)
 
 # Get environment variables
+TABLE_NAME = os.environ['TABLE_NAME']
 BUCKET_NAME = os.environ['BUCKET_NAME']
 API_URL = os.environ['API_URL']
+table = dynamodb.Table(TABLE_NAME)
+
+# The size alarm evaluates one 1-minute datapoint; allow for the minute to close,
+# the alarm evaluation and the cleaner invocation before giving up
+CLEANUP_TIMEOUT = 150
 
 # Initialize logger
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
 
 def handler(event, context):
     """
@@ -26,6 +49,7 @@ def handler(event, context):
     try:
         # Step 1: Create assignment1.txt (19 bytes)
         content1 = "Empty Assignment 1"
+        put_time = utc_timestamp()
         s3.put_object(
             Bucket=BUCKET_NAME,
             Key="assignment1.txt",
@@ -33,9 +57,9 @@ def handler(event, context):
         )
         logger.info(f"Created assignment1.txt with content: '{content1}'")
         
-        # Wait for SNS/SQS/Lambda processing
-        logger.info("Waiting 10 seconds for processing...")
-        time.sleep(10)
+        # Wait for EventBridge/SQS/Lambda processing
+        logger.info("Waiting up to 10 seconds for processing...")
+        wait_until(lambda: size_row_exists(BUCKET_NAME, put_time), timeout=10)
         
         # Step 2: Create assignment2.txt (28 bytes)
         content2 = "Empty Assignment 2222222222"
@@ -47,15 +71,11 @@ def handler(event, context):
         logger.info(f"Created assignment2.txt with content: '{content2}'")
         
         # Wait for the alarm to trigger and cleaner to delete assignment2.txt
-        logger.info("Waiting 30 seconds for alarm and cleaner to process...")
-        time.sleep(30)
-        
-        # Check if assignment2.txt was deleted (this is just for logging)
-        try:
-            s3.head_object(Bucket=BUCKET_NAME, Key="assignment2.txt")
-            logger.info("assignment2.txt still exists - cleaner may not have been triggered")
-        except:
+        logger.info(f"Waiting up to {CLEANUP_TIMEOUT} seconds for alarm and cleaner to process...")
+        if wait_until(lambda: object_missing(BUCKET_NAME, "assignment2.txt"), timeout=CLEANUP_TIMEOUT):
             logger.info("assignment2.txt was deleted by the cleaner as expected")
+        else:
+            logger.info("assignment2.txt still exists - cleaner may not have been triggered")
         
         # Step 3: Create assignment3.txt (2 bytes)
         content3 = "33"
@@ -67,21 +87,19 @@ def handler(event, context):
         logger.info(f"Created assignment3.txt with content: '{content3}'")
         
         # Wait for the alarm to trigger and cleaner to delete assignment1.txt
-        logger.info("Waiting 30 seconds for alarm and cleaner to process...")
-        time.sleep(30)
-        
-        # Check if assignment1.txt was deleted (this is just for logging)
-        try:
-            s3.head_object(Bucket=BUCKET_NAME, Key="assignment1.txt")
-            logger.info("assignment1.txt still exists - cleaner may not have been triggered")
-        except:
+        logger.info(f"Waiting up to {CLEANUP_TIMEOUT} seconds for alarm and cleaner to process...")
+        if wait_until(lambda: object_missing(BUCKET_NAME, "assignment1.txt"), timeout=CLEANUP_TIMEOUT):
             logger.info("assignment1.txt was deleted by the cleaner as expected")
+        else:
+            logger.info("assignment1.txt still exists - cleaner may not have been triggered")
         
         # Call the plotting API
         logger.info(f"Calling plotting API at: {API_URL}")
-        with urllib.request.urlopen(API_URL) as response:
-            api_response = response.read().decode('utf-8')
-            logger.info(f"API Response: {api_response}")
+        response = http.request('GET', API_URL)
+        api_response = response.data.decode('utf-8')
+        logger.info(f"API Response: {api_response}")
+        if response.status >= 400:
+            raise RuntimeError(f"Plotting API returned HTTP {response.status}")
         
         return {
             'statusCode': 200,
@@ -89,4 +107,48 @@ def handler(event, context):
         }
     except Exception as e:
         logger.error(f"Error in driver execution: {e}")
-        raise
\ No newline at end of file
+        raise
+
+def wait_until(predicate, timeout, interval=0.5):
+    """
+    Poll predicate until it returns True or timeout seconds have passed.
+    
+    Returns:
+        bool: True if the predicate was satisfied, False on timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        if predicate():
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+def utc_timestamp():
+    """
+    Current time in the same UTC ISO format the size-tracking lambda uses for sort keys.
+    """
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds')
+
+def size_row_exists(bucket_name, after_timestamp):
+    """
+    Check whether the size-tracking lambda has stored a bucket size row since after_timestamp.
+    """
+    response = table.query(
+        KeyConditionExpression=Key('bucketName').eq(bucket_name) &
+                              Key('timestamp').between(after_timestamp, utc_timestamp()),
+        Limit=1
+    )
+    return bool(response['Items'])
+
+def object_missing(bucket_name, key):
+    """
+    Check whether the given object no longer exists in the bucket.
+    """
+    try:
+        s3.head_object(Bucket=bucket_name, Key=key)
+        return False
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+            return True
+        raise
@@ -1,145 +1,176 @@
 import json
 import boto3
+from botocore.config import Config
 import os
 import logging
-import datetime
+import threading
 
-# Initialize AWS services
-s3 = boto3.client('s3')
-logs_client = boto3.client('logs')
-cloudwatch = boto3.client('cloudwatch')
+# Initialize AWS services once per container so warm invocations reuse the connection
+client_config = Config(
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive'},
+    max_pool_connections=10
+)
+cloudwatch = boto3.client('cloudwatch', config=client_config)
+dynamodb = boto3.resource('dynamodb', config=client_config)
+
+def prewarm_clients():
+    """
+    Issue one cheap request per client so credential resolution, signer setup and
+    the TLS handshake happen during init rather than on the first SQS record.
+    """
+    try:
+        cloudwatch.list_metrics(Namespace='Assignment4App', MetricName='TotalObjectSize')
+        dynamodb.meta.client.describe_table(TableName=TABLE_NAME)
+    except Exception as e:
+        logger.debug(f"Client pre-warm failed: {e}")
 
 # Get environment variables
+TABLE_NAME = os.environ['TABLE_NAME']
 BUCKET_NAME = os.environ['BUCKET_NAME']
+table = dynamodb.Table(TABLE_NAME)
 PUBLISH_METRICS = os.environ.get('PUBLISH_METRICS', 'false').lower() == 'true'
 
 # Initialize logger
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
+
+threading.Thread(target=prewarm_clients, daemon=True).start()
 
 def handler(event, context):
     """
     Process SQS messages containing S3 events and log object size changes to CloudWatch.
-    This function is triggered by SQS events that originate from S3 events via SNS.
+    This function is triggered by SQS events that originate from S3 events via EventBridge.
     """
-    logger.info(f"Received event: {json.dumps(event)}")
+    # Ignore invocations that don't come from the SQS event source (e.g. console test events)
+    records = event.get('Records')
+    if not records:
+        logger.warning("Invocation has no SQS records, nothing to process")
+        return {'batchItemFailures': []}
+    
+    logger.debug("Received event: %s", event)
+    
+    # Collect failed message IDs so SQS only retries those records
+    batch_item_failures = []
     
-    # Process each SQS message (which contains S3 events via SNS)
-    for record in event['Records']:
+    # Metric data points for the whole batch, published together below
+    metric_data = []
+    
+    # Process each SQS message (which contains an S3 event via EventBridge)
+    for record in records:
         try:
-            # Parse the SQS message body (which contains the SNS message)
-            body = json.loads(record['body'])
+            # Parse the SQS message body (which contains the EventBridge event);
+            # the event source mapping only delivers events for our bucket
+            s3_event = json.loads(record['body'])
+            logger.debug("Processing S3 event: %s", s3_event)
             
-            # Parse the SNS message (which contains the actual S3 event)
-            if 'Message' in body:
-                s3_event = json.loads(body['Message'])
-                logger.info(f"Processing S3 event: {json.dumps(s3_event)}")
-                
-                # Process S3 event records
-                if 'Records' in s3_event:
-                    for s3_record in s3_event['Records']:
-                        if s3_record['eventSource'] == 'aws:s3':
-                            # Skip processing if this is not our target bucket
-                            if s3_record['s3']['bucket']['name'] != BUCKET_NAME:
-                                logger.info(f"Skipping event for bucket {s3_record['s3']['bucket']['name']}")
-                                continue
-                            
-                            # Process the S3 event
-                            process_s3_event(s3_record)
+            # Process the S3 event
+            process_s3_event(s3_event, metric_data)
         except Exception as e:
             logger.error(f"Error processing SQS message: {e}")
-            continue
+            batch_item_failures.append({'itemIdentifier': record['messageId']})
+    
+    if metric_data and PUBLISH_METRICS:
+        publish_metrics(metric_data)
+    
+    return {'batchItemFailures': batch_item_failures}
 
-def process_s3_event(s3_record):
+def process_s3_event(s3_event, metric_data):
     """
-    Process an S3 event and log information about object size changes.
+    Process an S3 EventBridge event and log information about object size changes.
     """
     try:
-        event_name = s3_record['eventName']
-        object_key = s3_record['s3']['object']['key']
+        event_type = s3_event['detail-type']
+        object_key = s3_event['detail']['object']['key']
         
-        if event_name.startswith('ObjectCreated'):
+        if event_type == 'Object Created':
             # For object creation, get the size from the event
-            size_delta = s3_record['s3']['object'].get('size', 0)
-            log_size_change(object_key, size_delta)
+            size_delta = s3_event['detail']['object'].get('size', 0)
+            record_object_size(object_key, size_delta)
+            log_size_change(object_key, size_delta, metric_data)
             
-        elif event_name.startswith('ObjectRemoved'):
+        elif event_type == 'Object Deleted':
             # For object deletion, we need to find the size of the deleted object
-            # This requires searching CloudWatch logs for the previous creation event
+            # This was recorded in DynamoDB when the object was created
             size_delta = find_deleted_object_size(object_key)
             if size_delta > 0:
-                log_size_change(object_key, -size_delta)  # Negative size for deletions
+                log_size_change(object_key, -size_delta, metric_data)  # Negative size for deletions
     except Exception as e:
         logger.error(f"Error processing S3 event: {e}")
         raise
 
-def log_size_change(object_name, size_delta):
+def log_size_change(object_name, size_delta, metric_data):
     """
-    Log object size changes and publish metric directly to CloudWatch.
+    Log object size changes and queue the metric data point for publishing.
     """
     log_data = {
         "object_name": object_name,
         "size_delta": size_delta
     }
     
-    # Log as plain string for better visibility in CloudWatch logs
-    print(json.dumps(log_data))
-    
-    # Also log with logger for good measure
+    # Serialize once and emit a single line to CloudWatch logs
     logger.info(json.dumps(log_data))
     
-    # Publish metric directly to CloudWatch if enabled
-    if PUBLISH_METRICS:
+    metric_data.append({
+        'MetricName': 'TotalObjectSize',
+        'Value': size_delta,
+        'Unit': 'Bytes',
+        'StorageResolution': 1
+    })
+
+def publish_metrics(metric_data):
+    """
+    Publish the batch's metric data points directly to CloudWatch.
+    PutMetricData accepts up to 1000 data points per request.
+    """
+    for start in range(0, len(metric_data), 1000):
         try:
             cloudwatch.put_metric_data(
                 Namespace="Assignment4App",
-                MetricData=[
-                    {
-                        'MetricName': 'TotalObjectSize',
-                        'Value': size_delta,
-                        'Unit': 'Bytes'
-                    }
-                ]
+                MetricData=metric_data[start:start + 1000]
             )
-            logger.info(f"Published metric: TotalObjectSize = {size_delta}")
+            logger.info(f"Published {len(metric_data[start:start + 1000])} TotalObjectSize data points")
         except Exception as e:
-            logger.error(f"Error publishing metric: {e}")
+            logger.error(f"Error publishing metrics: {e}")
 
 def find_deleted_object_size(object_key):
     """
-    Search CloudWatch logs to find the size of a deleted object from its creation event.
+    Look up and remove the size recorded for an object when it was created.
+    The delete returns the old row, so the lookup takes a single request.
     """
     try:
-        # Get the log group name from the environment variable
-        log_group_name = f"/aws/lambda/{os.environ.get('AWS_LAMBDA_FUNCTION_NAME')}"
+        response = table.delete_item(
+            Key=get_logged_size_key(object_key),
+            ReturnValues='ALL_OLD'
+        )
         
-        # Calculate the start time (24 hours ago)
-        start_time = int((datetime.datetime.now() - datetime.timedelta(days=1)).timestamp() * 1000)
-        
-        try:
-            # Try to search for logs containing the object creation
-            response = logs_client.filter_log_events(
-                logGroupName=log_group_name,
-                filterPattern=f'{{$.object_name = "{object_key}"}}',
-                startTime=start_time
-            )
-            
-            # Find the most recent creation event for this object
-            for event in response.get('events', []):
-                try:
-                    log_message = json.loads(event['message'])
-                    if 'object_name' in log_message and log_message['object_name'] == object_key:
-                        if 'size_delta' in log_message and log_message['size_delta'] > 0:
-                            return log_message['size_delta']
-                except json.JSONDecodeError:
-                    continue
-                    
+        if 'Attributes' not in response:
             # If we can't find the size, log a warning and return 0
             logger.warning(f"Could not find size for deleted object: {object_key}")
             return 0
-        except Exception as e:
-            logger.warning(f"Error searching logs, using default size 0: {e}")
-            return 0
+        
+        return int(response['Attributes']['loggedSize'])
     except Exception as e:
         logger.error(f"Error finding deleted object size: {e}")
-        return 0
\ No newline at end of file
+        return 0
+
+def record_object_size(object_key, size):
+    """
+    Remember the size of a created object so its deletion can be logged with a negative delta.
+    """
+    table.put_item(
+        Item={
+            **get_logged_size_key(object_key),
+            'loggedSize': size
+        }
+    )
+
+def get_logged_size_key(object_key):
+    """
+    Rows are keyed by a 'logged#' prefixed sort key next to the bucket size history.
+    The size is stored as 'loggedSize' so these rows stay out of the sparse SizeIndex.
+    """
+    return {
+        'bucketName': BUCKET_NAME,
+        'timestamp': f"logged#{object_key}"
+    }
@@ -1,43 +1,69 @@
 import os
 import json
 import boto3
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend
-import matplotlib.pyplot as plt
+from botocore.config import Config
+from boto3.s3.transfer import TransferConfig
+from PIL import Image, ImageDraw
 import datetime
-from decimal import Decimal
+import time
+from functools import lru_cache
 import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from boto3.dynamodb.conditions import Key
 
-# Initialize boto3 clients
-dynamodb = boto3.resource('dynamodb')
-s3_client = boto3.client('s3')
+# Initialize boto3 clients once per container so warm invocations reuse the connection
+client_config = Config(
+    tcp_keepalive=True,
+    retries={'mode': 'standard', 'max_attempts': 2},
+    max_pool_connections=50
+)
+dynamodb = boto3.resource('dynamodb', config=client_config)
+dynamodb_client = boto3.client('dynamodb', config=client_config)
+s3_client = boto3.client('s3', config=client_config)
+
+# Plots below one part size go up in a single PUT; larger ones are uploaded in parallel parts
+transfer_config = TransferConfig(
+    multipart_threshold=5 * 1024 * 1024,
+    multipart_chunksize=5 * 1024 * 1024,
+    max_concurrency=4,
+    use_threads=True
+)
+
+# Initialize logger
+logger = logging.getLogger()
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
 
 # Get environment variables - updated variable names
 table_name = os.environ['TABLE_NAME']  # Changed from DYNAMODB_TABLE_NAME
 bucket_name = os.environ['BUCKET_NAME']  # Changed from S3_BUCKET_NAME
 table = dynamodb.Table(table_name)
 
+# Partition key of the size history table, as defined in the storage stack
+PK_NAME = os.environ.get('PK_NAME', 'bucketName')
+
+# Plot canvas, in pixels
+PLOT_WIDTH = 1000
+PLOT_HEIGHT = 600
+PLOT_MARGINS = {'left': 90, 'top': 50, 'right': 30, 'bottom': 90}
+CHAR_WIDTH = 6  # Approximate width of the default Pillow font
+
+# Only fetch the attributes the plot needs ('timestamp' is a reserved word)
+SERIES_PROJECTION = {
+    'ProjectionExpression': '#ts, totalSize, total_size',
+    'ExpressionAttributeNames': {'#ts': 'timestamp'}
+}
+
 def handler(event, context):
     """
     Lambda function to generate a plot of S3 bucket size over time.
     Retrieves data from DynamoDB and creates a plot that is saved to S3.
     """
-    print(f"Received event: {json.dumps(event)}")
+    logger.debug("Received event: %s", event)
     
     try:
-        # Get the current time and calculate the time 10 seconds ago
-        current_time = datetime.datetime.now()
-        ten_seconds_ago = current_time - datetime.timedelta(seconds=10)
-        
-        # Get bucket size data for the last 10 seconds
-        recent_data = get_recent_bucket_data(bucket_name, ten_seconds_ago.isoformat())
-        
-        # Get the maximum bucket size ever recorded
-        max_size = get_max_bucket_size(bucket_name)
-        
-        # Generate and save the plot
-        plot_url = generate_plot(recent_data, max_size)
+        # Requests within the same second share one query, render and upload
+        plot_url = build_plot(int(time.time()))
         
         return {
             'statusCode': 200,
@@ -50,95 +76,77 @@ def handler(event, context):
             })
         }
     except Exception as e:
-        print(f"Error generating plot: {str(e)}")
+        logger.error(f"Error generating plot: {str(e)}")
         return {
             'statusCode': 500,
             'body': json.dumps({'error': str(e)})
         }
 
-def get_recent_bucket_data(bucket_name, start_timestamp):
+@lru_cache(maxsize=4)
+def build_plot(second):
+    """
+    Plot the 10 seconds of bucket size data ending with the given epoch second
+    and return the presigned URL. Results are cached per second so bursts of
+    warm invocations reuse the same plot; failures are not cached.
+    """
+    # Get the end of the current second and calculate the time 10 seconds before it
+    current_time = datetime.datetime.fromtimestamp(second + 1, datetime.timezone.utc)
+    ten_seconds_ago = current_time - datetime.timedelta(seconds=10)
+    
+    # Get bucket size data for the last 10 seconds and the maximum bucket
+    # size ever recorded; the two reads are independent, so run them together
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        recent_future = executor.submit(
+            get_recent_bucket_data, bucket_name,
+            ten_seconds_ago.isoformat(timespec='milliseconds'),
+            current_time.isoformat(timespec='milliseconds')
+        )
+        max_future = executor.submit(get_max_bucket_size, bucket_name)
+        recent_data, max_size = recent_future.result(), max_future.result()
+    
+    # Generate and save the plot
+    return generate_plot(recent_data, max_size)
+
+def get_recent_bucket_data(bucket_name, start_timestamp, end_timestamp):
     """
     Query DynamoDB to get bucket size data for the last 10 seconds.
+    The upper bound keeps non-timestamp rows (e.g. per-object sizes) out of the results.
     """
     try:
-        # Query with bucket_name as partition key
         response = table.query(
-            KeyConditionExpression=Key('bucketName').eq(bucket_name) & 
-                                  Key('timestamp').gte(start_timestamp)
+            KeyConditionExpression=Key(PK_NAME).eq(bucket_name) & 
+                                  Key('timestamp').between(start_timestamp, end_timestamp),
+            **SERIES_PROJECTION
         )
         
         # Sort data by timestamp
         items = sorted(response['Items'], key=lambda x: x['timestamp'])
         return items
     except Exception as e:
-        print(f"Error querying recent bucket data: {str(e)}")
-        # Try alternative key names if the first attempt fails
-        try:
-            response = table.query(
-                KeyConditionExpression=Key('bucket_name').eq(bucket_name) & 
-                                     Key('timestamp').gte(start_timestamp)
-            )
-            items = sorted(response['Items'], key=lambda x: x['timestamp'])
-            return items
-        except Exception as e2:
-            print(f"Second attempt failed: {str(e2)}")
-            raise
+        logger.error(f"Error querying recent bucket data: {str(e)}")
+        raise
 
 def get_max_bucket_size(bucket_name):
     """
-    Query DynamoDB to get the maximum bucket size ever recorded.
+    Read the maximum bucket size ever recorded from the 'MAX' sentinel row
+    kept up to date by the size-tracking lambda.
     """
     try:
-        # Query with bucketName as the partition key
-        response = table.query(
-            KeyConditionExpression=Key('bucketName').eq(bucket_name)
+        # Use a plain low-level client: the Table's own client (table.meta.client)
+        # would serialize the already-typed {'S': ...} key a second time
+        response = dynamodb_client.get_item(
+            TableName=table_name,
+            Key={PK_NAME: {'S': bucket_name}, 'timestamp': {'S': 'MAX'}},
+            ProjectionExpression='totalSize'
         )
         
-        if not response['Items']:
+        if 'Item' not in response:
             return 0
         
-        # Make sure size field exists in the items (check both possible field names)
-        max_size = 0
-        for item in response['Items']:
-            # Check for different possible field names
-            if 'totalSize' in item:
-                size = float(item['totalSize'])
-            elif 'total_size' in item:
-                size = float(item['total_size'])
-            else:
-                continue
-                
-            if size > max_size:
-                max_size = size
-                
-        return max_size
+        return float(response['Item']['totalSize']['N'])
     except Exception as e:
-        print(f"Error querying max bucket size: {str(e)}")
-        # Try alternative key names if the first attempt fails
-        try:
-            response = table.query(
-                KeyConditionExpression=Key('bucket_name').eq(bucket_name)
-            )
-            if not response['Items']:
-                return 0
-                
-            max_size = 0
-            for item in response['Items']:
-                if 'totalSize' in item:
-                    size = float(item['totalSize'])
-                elif 'total_size' in item:
-                    size = float(item['total_size'])
-                else:
-                    continue
-                    
-                if size > max_size:
-                    max_size = size
-                    
-            return max_size
-        except Exception as e2:
-            print(f"Second attempt failed: {str(e2)}")
-            print(f"First few items: {json.dumps(response['Items'][:2], default=str) if 'Items' in response and response['Items'] else 'No items'}")
-            raise
+        logger.error(f"Error reading max bucket size: {str(e)}")
+        raise
 
 def generate_plot(data, max_size):
     """
@@ -158,37 +166,19 @@ def generate_plot(data, max_size):
             elif 'total_size' in item:
                 sizes.append(float(item['total_size']))
             else:
-                print(f"Warning: size field not found in item: {json.dumps(item, default=str)}")
+                logger.warning(f"Size field not found in item: {item}")
                 sizes.append(0)  # Default if field not found
         
-        # Create plot
-        plt.figure(figsize=(10, 6))
-        plt.plot(timestamps, sizes, 'bo-', label='Bucket Size')
-        
-        # Add a horizontal line for max size
-        if max_size > 0:
-            plt.axhline(y=float(max_size), color='r', linestyle='--', 
-                       label=f'Max Size: {float(max_size)} bytes')
-        
-        # Format the plot
-        plt.title('S3 Bucket Size Over Time')
-        plt.xlabel('Timestamp')
-        plt.ylabel('Size (bytes)')
-        plt.xticks(rotation=45)
-        plt.legend()
-        plt.tight_layout()
-        
-        # Save the plot to a buffer
-        buffer = io.BytesIO()
-        plt.savefig(buffer, format='png')
-        buffer.seek(0)
+        # Render the plot and save it to a buffer
+        buffer = render_plot(timestamps, sizes, float(max_size))
         
         # Upload the plot to S3
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key='plot',
-            Body=buffer,
-            ContentType='image/png'
+        s3_client.upload_fileobj(
+            buffer,
+            bucket_name,
+            'plot',
+            ExtraArgs={'ContentType': 'image/png'},
+            Config=transfer_config
         )
         
         # Generate a pre-signed URL for the plot (valid for 1 hour)
@@ -198,9 +188,81 @@ def generate_plot(data, max_size):
             ExpiresIn=3600
         )
         
-        plt.close()  # Close the plot to free memory
-        
         return plot_url
     except Exception as e:
-        print(f"Error generating plot: {str(e)}")
-        raise
\ No newline at end of file
+        logger.error(f"Error generating plot: {str(e)}")
+        raise
+
+def render_plot(timestamps, sizes, max_size):
+    """
+    Draw the bucket size line and the max-size reference line with Pillow.
+    
+    Returns:
+        io.BytesIO: The PNG image, positioned at the start.
+    """
+    image = Image.new('RGB', (PLOT_WIDTH, PLOT_HEIGHT), 'white')
+    draw = ImageDraw.Draw(image)
+    
+    left = PLOT_MARGINS['left']
+    top = PLOT_MARGINS['top']
+    right = PLOT_WIDTH - PLOT_MARGINS['right']
+    bottom = PLOT_HEIGHT - PLOT_MARGINS['bottom']
+    
+    # Scale sizes onto pixel rows, leaving headroom above the largest value
+    y_limit = max(sizes + [max_size, 1]) * 1.1
+    
+    def to_y(size):
+        return bottom - (size / y_limit) * (bottom - top)
+    
+    def to_x(index):
+        if len(timestamps) == 1:
+            return (left + right) / 2
+        return left + index * (right - left) / (len(timestamps) - 1)
+    
+    # Axes, y ticks and labels
+    draw.line([(left, top), (left, bottom), (right, bottom)], fill='black')
+    for tick in range(5):
+        value = y_limit * tick / 4
+        y = to_y(value)
+        label = f"{value:.0f}"
+        draw.line([(left - 5, y), (left, y)], fill='black')
+        draw.text((left - 10 - CHAR_WIDTH * len(label), y - 5), label, fill='black')
+    
+    title = 'S3 Bucket Size Over Time'
+    draw.text(((PLOT_WIDTH - CHAR_WIDTH * len(title)) / 2, top / 2), title, fill='black')
+    draw.text(((left + right - CHAR_WIDTH * len('Timestamp')) / 2, PLOT_HEIGHT - 25), 'Timestamp', fill='black')
+    draw.text((10, top - 25), 'Size (bytes)', fill='black')
+    
+    # x tick labels show the time of day, thinned out so they do not overlap
+    label_step = max(1, len(timestamps) // 10)
+    for index in range(0, len(timestamps), label_step):
+        x = to_x(index)
+        label = timestamps[index][11:19]
+        draw.line([(x, bottom), (x, bottom + 5)], fill='black')
+        draw.text((x - CHAR_WIDTH * len(label) / 2, bottom + 10), label, fill='black')
+    
+    # Bucket size series
+    points = [(to_x(index), to_y(size)) for index, size in enumerate(sizes)]
+    if len(points) > 1:
+        draw.line(points, fill='blue', width=2)
+    for x, y in points:
+        draw.ellipse([(x - 4, y - 4), (x + 4, y + 4)], fill='blue')
+    
+    # Legend
+    legend_x = right - 220
+    draw.line([(legend_x, top + 10), (legend_x + 30, top + 10)], fill='blue', width=2)
+    draw.text((legend_x + 40, top + 5), 'Bucket Size', fill='black')
+    
+    # Dashed horizontal line for max size
+    if max_size > 0:
+        y = to_y(max_size)
+        for x in range(left, right, 12):
+            draw.line([(x, y), (min(x + 6, right), y)], fill='red', width=2)
+        
+        draw.line([(legend_x, top + 30), (legend_x + 30, top + 30)], fill='red', width=2)
+        draw.text((legend_x + 40, top + 25), f'Max Size: {max_size} bytes', fill='black')
+    
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', optimize=True)
+    buffer.seek(0)
+    return buffer
@@ -1,90 +1,611 @@
 import json
 import boto3
+from botocore.config import Config
 import os
 import datetime
+import time
 import logging
+import csv
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+from boto3.dynamodb.conditions import Key
+from operator import itemgetter
 
-# Initialize AWS services
-s3 = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
+# Sum listing pages in C instead of a per-object Python loop
+get_size = itemgetter('Size')
+
+# Number of prefixes listed in parallel when the bucket has to be listed
+LIST_WORKERS = 16
+
+# Initialize AWS services once per container so warm invocations reuse the connection
+client_config = Config(
+    tcp_keepalive=True,
+    retries={'mode': 'standard', 'max_attempts': 2},
+    max_pool_connections=LIST_WORKERS
+)
+s3 = boto3.client('s3', config=client_config)
+cloudwatch = boto3.client('cloudwatch', config=client_config)
+dynamodb = boto3.resource('dynamodb', config=client_config)
+dynamodb_client = boto3.client('dynamodb', config=client_config)
 
 # Get environment variables
 TABLE_NAME = os.environ['TABLE_NAME']
 BUCKET_NAME = os.environ['BUCKET_NAME']
+table = dynamodb.Table(TABLE_NAME)
+
+# Where the running totals are seeded from: 'list', 'cloudwatch' or 'inventory'
+SIZE_SOURCE = os.environ.get('SIZE_SOURCE', 'list')
+INVENTORY_BUCKET = os.environ.get('INVENTORY_BUCKET')
+INVENTORY_PREFIX = os.environ.get('INVENTORY_PREFIX', '')
+
+# Running totals and the largest total ever seen live in single rows next to the history
+CURRENT_SORT_KEY = 'CURRENT'
+MAX_SORT_KEY = 'MAX'
+
+# TransactWriteItems takes at most 100 actions; one of them is the totals update
+TRANSACTION_CHANGES = 99
 
 # Initialize logger
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
 
 def handler(event, context):
     """
     Process SQS messages containing S3 events and update DynamoDB with bucket size information.
-    This function is triggered by SQS events that originate from S3 events via SNS.
+    This function is triggered by SQS events that originate from S3 events via EventBridge.
     """
-    logger.info(f"Received event: {json.dumps(event)}")
+    # Ignore invocations that don't come from the SQS event source (e.g. console test events)
+    records = event.get('Records')
+    if not records:
+        logger.warning("Invocation has no SQS records, nothing to process")
+        return {'batchItemFailures': []}
     
-    # Process each SQS message (which contains S3 events via SNS)
-    for record in event['Records']:
+    logger.debug("Received event: %s", event)
+    
+    # Collect failed message IDs so SQS only retries those records
+    batch_item_failures = []
+    
+    # Per-object index changes and the messages they came from, flushed together below
+    object_size_changes = []
+    processed_message_ids = []
+    
+    # Process each SQS message (which contains an S3 event via EventBridge)
+    for record in records:
         try:
-            # Parse the SQS message body (which contains the SNS message)
-            body = json.loads(record['body'])
+            # Parse the SQS message body (which contains the EventBridge event);
+            # the event source mapping only delivers events for our bucket
+            s3_event = json.loads(record['body'])
+            logger.debug("Processing S3 event: %s", s3_event)
             
-            # Parse the SNS message (which contains the actual S3 event)
-            if 'Message' in body:
-                s3_event = json.loads(body['Message'])
-                logger.info(f"Processing S3 event: {json.dumps(s3_event)}")
-                
-                # Process S3 event records
-                if 'Records' in s3_event:
-                    for s3_record in s3_event['Records']:
-                        if s3_record['eventSource'] == 'aws:s3':
-                            # Skip processing if this is not our target bucket
-                            if s3_record['s3']['bucket']['name'] != BUCKET_NAME:
-                                logger.info(f"Skipping event for bucket {s3_record['s3']['bucket']['name']}")
-                                continue
-                            
-                            # Calculate total bucket size
-                            calculate_and_store_bucket_size(BUCKET_NAME)
+            # Keep the per-object size index in sync for the cleaner
+            object_size_changes.append(get_object_size_change(BUCKET_NAME, s3_event))
+            
+            processed_message_ids.append(record['messageId'])
         except Exception as e:
             logger.error(f"Error processing SQS message: {e}")
-            continue
+            batch_item_failures.append({'itemIdentifier': record['messageId']})
+    
+    if object_size_changes:
+        try:
+            apply_object_size_changes(BUCKET_NAME, object_size_changes)
+        except Exception as e:
+            logger.error(f"Error storing batch results: {e}")
+            batch_item_failures.extend(
+                {'itemIdentifier': message_id} for message_id in processed_message_ids
+            )
+    
+    return {'batchItemFailures': batch_item_failures}
+
+def reconcile_handler(event, context):
+    """
+    Scheduled job that lists the whole bucket, overwrites the running totals and
+    resyncs the per-object rows behind the SizeIndex, correcting any drift left
+    by events that were lost, replayed, or predate the deployment.
+    The index can only be rebuilt from a listing, so SIZE_SOURCE is not used here.
+    """
+    object_sizes = list_object_sizes(BUCKET_NAME)
+    resync_object_index(BUCKET_NAME, object_sizes)
+    
+    total_size = sum(object_sizes.values())
+    object_count = len(object_sizes)
+    table.put_item(
+        Item={
+            'bucketName': BUCKET_NAME,
+            'timestamp': CURRENT_SORT_KEY,
+            'totalSize': total_size,
+            'objectCount': object_count
+        }
+    )
+    update_max_bucket_size(BUCKET_NAME, total_size)
+    store_bucket_size(BUCKET_NAME, total_size, object_count)
+    
+    logger.info(f"Reconciled bucket {BUCKET_NAME} - Size: {total_size}, Count: {object_count}")
+    return {'totalSize': total_size, 'objectCount': object_count}
+
+def resync_object_index(bucket_name, object_sizes):
+    """
+    Make the 'object#' rows match the listed object sizes: add missing rows,
+    fix rows with a stale size and delete rows for objects that no longer exist.
+    """
+    indexed_sizes = get_indexed_object_sizes(bucket_name)
+    
+    changes = []
+    for object_key, size in object_sizes.items():
+        change = ('put', {
+            'bucketName': bucket_name,
+            'timestamp': f"object#{object_key}",
+            'objectKey': object_key,
+            'size': size
+        })
+        if indexed_sizes.pop(change[1]['timestamp'], None) != size:
+            changes.append(change)
+    
+    changes.extend(
+        ('delete', {'bucketName': bucket_name, 'timestamp': sort_key})
+        for sort_key in indexed_sizes
+    )
+    
+    if changes:
+        write_object_sizes(changes)
+    logger.info(f"Resynced object size index for bucket {bucket_name} with {len(changes)} changes")
 
-def calculate_and_store_bucket_size(bucket_name):
+def get_indexed_object_sizes(bucket_name):
     """
-    Calculate the total size of all objects in the given S3 bucket
-    and store the result in DynamoDB.
+    Read every 'object#' row for the bucket.
+    
+    Returns:
+        dict: Sort key to size (int).
+    """
+    sizes = {}
+    query_args = {
+        'KeyConditionExpression': Key('bucketName').eq(bucket_name) & Key('timestamp').begins_with('object#'),
+        'ProjectionExpression': '#ts, #sz',
+        'ExpressionAttributeNames': {'#ts': 'timestamp', '#sz': 'size'}
+    }
+    
+    while True:
+        response = table.query(**query_args)
+        for item in response['Items']:
+            sizes[item['timestamp']] = int(item['size'])
+        if 'LastEvaluatedKey' not in response:
+            return sizes
+        query_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def get_object_size_change(bucket_name, s3_event):
+    """
+    Build the change to the per-object size row that backs the SizeIndex GSI.
+    Rows are keyed by an 'object#' prefixed sort key so they never collide
+    with the timestamped bucket size history.
+    
+    Returns:
+        tuple: ('put', item) for created objects or ('delete', key) for removed ones.
+    """
+    s3_object = s3_event['detail']['object']
+    object_key = s3_object['key']
+    
+    item_key = {
+        'bucketName': bucket_name,
+        'timestamp': f"object#{object_key}"
+    }
+    
+    if s3_event['detail-type'] == 'Object Deleted':
+        return ('delete', item_key)
+    
+    return ('put', {
+        **item_key,
+        'objectKey': object_key,
+        'size': s3_object.get('size', 0)
+    })
+
+def write_object_sizes(changes):
+    """
+    Apply per-object size changes with BatchWriteItem. The batch writer sends
+    25 items per request and resends any UnprocessedItems; when the same object
+    appears more than once in a batch, only its latest change is kept.
     """
     try:
-        # Get total size of the bucket
+        with table.batch_writer(overwrite_by_pkeys=['bucketName', 'timestamp']) as batch:
+            for action, payload in changes:
+                if action == 'delete':
+                    batch.delete_item(Key=payload)
+                else:
+                    batch.put_item(Item=payload)
+    except Exception as e:
+        logger.error(f"Error updating object size index: {e}")
+        raise
+
+def apply_object_size_changes(bucket_name, changes):
+    """
+    Apply a batch of per-object changes and move the bucket totals by their
+    net effect, instead of listing the whole bucket. Previous sizes come from
+    the per-object rows, so overwrites and deletes are netted out correctly.
+    Each group of row changes is written in one transaction together with its
+    delta, so a failed batch can be redelivered without dropping or repeating
+    a change. One bucket size snapshot is stored for the whole batch.
+    """
+    try:
+        # Only the last change to each object matters, and a transaction can touch an item only once
+        final_changes = {payload['timestamp']: (action, payload) for action, payload in changes}
+        
+        if get_bucket_totals(bucket_name) is None:
+            write_object_sizes(list(final_changes.values()))
+            total_size, object_count = seed_bucket_totals(bucket_name)
+        else:
+            known_sizes = get_object_sizes(bucket_name, final_changes)
+            sort_keys = list(final_changes)
+            for start in range(0, len(sort_keys), TRANSACTION_CHANGES):
+                write_object_sizes_with_totals(
+                    bucket_name,
+                    [final_changes[sort_key] for sort_key in sort_keys[start:start + TRANSACTION_CHANGES]],
+                    known_sizes
+                )
+            total_size, object_count = get_bucket_totals(bucket_name)
+        
+        update_max_bucket_size(bucket_name, total_size)
+        return store_bucket_size(bucket_name, total_size, object_count)
+    except Exception as e:
+        logger.error(f"Error applying object size changes: {e}")
+        raise
+
+def write_object_sizes_with_totals(bucket_name, changes, known_sizes):
+    """
+    Write per-object changes and add their net size and count delta to the
+    running totals in a single TransactWriteItems call. Each row is conditioned
+    on the size the delta was computed from, so a concurrent change to the same
+    object cancels the transaction instead of being netted against stale data.
+    """
+    size_delta = 0
+    count_delta = 0
+    transact_items = []
+    
+    for action, payload in changes:
+        old_size = known_sizes.get(payload['timestamp'])
+        new_size = payload['size'] if action == 'put' else None
+        
+        size_delta += (new_size or 0) - (old_size or 0)
+        count_delta += (new_size is not None) - (old_size is not None)
+        
+        if old_size is None:
+            condition = {'ConditionExpression': 'attribute_not_exists(#sz)'}
+        else:
+            condition = {
+                'ConditionExpression': '#sz = :old',
+                'ExpressionAttributeValues': {':old': old_size}
+            }
+        condition['ExpressionAttributeNames'] = {'#sz': 'size'}
+        
+        if action == 'delete':
+            transact_items.append({'Delete': {'TableName': TABLE_NAME, 'Key': payload, **condition}})
+        else:
+            transact_items.append({'Put': {'TableName': TABLE_NAME, 'Item': payload, **condition}})
+    
+    transact_items.append({
+        'Update': {
+            'TableName': TABLE_NAME,
+            'Key': {'bucketName': bucket_name, 'timestamp': CURRENT_SORT_KEY},
+            'UpdateExpression': 'ADD totalSize :size, objectCount :count',
+            'ConditionExpression': 'attribute_exists(totalSize)',
+            'ExpressionAttributeValues': {':size': size_delta, ':count': count_delta}
+        }
+    })
+    
+    # The resource's client serializes plain Python values, like the Table resource
+    dynamodb.meta.client.transact_write_items(TransactItems=transact_items)
+
+def get_object_sizes(bucket_name, sort_keys):
+    """
+    Read the stored size of each given per-object row with BatchGetItem.
+    Reads are strongly consistent, so a delete that follows its create
+    closely still sees the row the create wrote.
+    
+    Returns:
+        dict: Sort key to size (int) for every row that exists.
+    """
+    sizes = {}
+    sort_keys = list(sort_keys)
+    
+    # BatchGetItem accepts at most 100 keys per request
+    for start in range(0, len(sort_keys), 100):
+        request_items = {
+            TABLE_NAME: {
+                'Keys': [
+                    {'bucketName': bucket_name, 'timestamp': sort_key}
+                    for sort_key in sort_keys[start:start + 100]
+                ],
+                'ProjectionExpression': '#ts, #sz',
+                'ExpressionAttributeNames': {'#ts': 'timestamp', '#sz': 'size'},
+                'ConsistentRead': True
+            }
+        }
+        
+        attempt = 0
+        while request_items:
+            if attempt:
+                # Unprocessed keys mean the table is throttling us; back off before resending
+                time.sleep(min(0.05 * 2 ** attempt, 2))
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            for item in response['Responses'].get(TABLE_NAME, []):
+                sizes[item['timestamp']] = int(item['size'])
+            request_items = response.get('UnprocessedKeys')
+            attempt += 1
+    
+    return sizes
+
+def get_bucket_totals(bucket_name):
+    """
+    Read the bucket's running totals with a strongly consistent GetItem.
+    
+    Returns:
+        tuple: (total_size, object_count), or None if the totals were never seeded.
+    """
+    response = table.get_item(
+        Key={'bucketName': bucket_name, 'timestamp': CURRENT_SORT_KEY},
+        ConsistentRead=True
+    )
+    item = response.get('Item')
+    if item is None:
+        return None
+    return int(item['totalSize']), int(item['objectCount'])
+
+def seed_bucket_totals(bucket_name):
+    """
+    Seed the running totals from a measurement of the whole bucket, which
+    already reflects the events being applied. Seeding is idempotent, so a
+    batch that fails after its rows were written can simply be redelivered.
+    
+    Returns:
+        tuple: The seeded (total_size, object_count).
+    """
+    logger.info(f"No running totals for bucket {bucket_name}, seeding them from source '{SIZE_SOURCE}'")
+    total_size, object_count = measure_bucket_size(bucket_name)
+    
+    try:
+        table.put_item(
+            Item={
+                'bucketName': bucket_name,
+                'timestamp': CURRENT_SORT_KEY,
+                'totalSize': total_size,
+                'objectCount': object_count
+            },
+            ConditionExpression='attribute_not_exists(totalSize)'
+        )
+        return total_size, object_count
+    except dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
+        # Another invocation seeded the totals first
+        return get_bucket_totals(bucket_name)
+
+def update_max_bucket_size(bucket_name, total_size):
+    """
+    Raise the 'MAX' sentinel row to total_size if it is a new maximum,
+    so the plotting lambda can read it with a single GetItem.
+    """
+    try:
+        table.update_item(
+            Key={'bucketName': bucket_name, 'timestamp': MAX_SORT_KEY},
+            UpdateExpression='SET totalSize = :size',
+            ConditionExpression='attribute_not_exists(totalSize) OR totalSize < :size',
+            ExpressionAttributeValues={':size': total_size}
+        )
+    except dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
+        # The stored maximum is already at least this large
+        pass
+
+def measure_bucket_size(bucket_name):
+    """
+    Measure the total size and object count of the bucket from the configured SIZE_SOURCE.
+    Listing is exact; the CloudWatch storage metrics and S3 Inventory reports are
+    published daily, so they trade freshness for one or two requests on huge buckets.
+    
+    Returns:
+        tuple: (total_size, object_count)
+    """
+    if SIZE_SOURCE == 'cloudwatch':
+        return get_size_from_cloudwatch(bucket_name)
+    if SIZE_SOURCE == 'inventory':
+        return get_size_from_inventory(bucket_name, INVENTORY_BUCKET, INVENTORY_PREFIX)
+    return calculate_bucket_size(bucket_name)
+
+def get_size_from_cloudwatch(bucket_name):
+    """
+    Read the latest daily BucketSizeBytes and NumberOfObjects storage metrics for the bucket.
+    """
+    def latest_datapoint(metric_name, storage_type):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        response = cloudwatch.get_metric_statistics(
+            Namespace='AWS/S3',
+            MetricName=metric_name,
+            Dimensions=[
+                {'Name': 'BucketName', 'Value': bucket_name},
+                {'Name': 'StorageType', 'Value': storage_type}
+            ],
+            StartTime=now - datetime.timedelta(days=2),
+            EndTime=now,
+            Period=86400,
+            Statistics=['Average']
+        )
+        datapoints = response['Datapoints']
+        if not datapoints:
+            return None
+        return int(max(datapoints, key=lambda point: point['Timestamp'])['Average'])
+    
+    try:
+        total_size = latest_datapoint('BucketSizeBytes', 'StandardStorage')
+        object_count = latest_datapoint('NumberOfObjects', 'AllStorageTypes')
+        
+        # New buckets have no storage metrics yet; seeding 0 would make later deletes go negative
+        if total_size is None or object_count is None:
+            logger.warning(f"No storage metrics for bucket {bucket_name} yet, listing it instead")
+            return calculate_bucket_size(bucket_name)
+        
+        return total_size, object_count
+    except Exception as e:
+        logger.error(f"Error reading bucket size metrics: {e}")
+        raise
+
+def get_size_from_inventory(bucket_name, inventory_bucket, inventory_prefix):
+    """
+    Sum the Size column of the latest CSV S3 Inventory report for the bucket.
+    Reports are delivered under '<prefix>/<source bucket>/<config id>/', so only
+    manifests for this bucket are considered. The newest manifest.json lists the
+    gzipped CSV files and their column order; each file is streamed and summed in a single pass.
+    """
+    if not inventory_bucket:
+        raise ValueError("SIZE_SOURCE is 'inventory' but INVENTORY_BUCKET is not set")
+    
+    try:
+        report_prefix = f"{inventory_prefix.strip('/')}/{bucket_name}/".lstrip('/')
+        
+        manifests = []
+        paginator = s3.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=inventory_bucket, Prefix=report_prefix):
+            manifests.extend(
+                obj for obj in page.get('Contents', []) if obj['Key'].endswith('/manifest.json')
+            )
+        
+        if not manifests:
+            raise ValueError(f"No inventory manifest found in s3://{inventory_bucket}/{report_prefix}")
+        
+        manifest_key = max(manifests, key=lambda obj: obj['LastModified'])['Key']
+        manifest = json.loads(s3.get_object(Bucket=inventory_bucket, Key=manifest_key)['Body'].read())
+        
+        if manifest.get('sourceBucket') != bucket_name:
+            raise ValueError(f"Inventory manifest {manifest_key} is for bucket {manifest.get('sourceBucket')}")
+        
+        if manifest.get('fileFormat') != 'CSV':
+            raise ValueError(f"Unsupported inventory format: {manifest.get('fileFormat')}")
+        
+        columns = [column.strip() for column in manifest['fileSchema'].split(',')]
+        size_column = columns.index('Size')
+        
+        total_size = 0
+        object_count = 0
+        for inventory_file in manifest['files']:
+            body = s3.get_object(Bucket=inventory_bucket, Key=inventory_file['key'])['Body']
+            with gzip.GzipFile(fileobj=body) as stream:
+                lines = (line.decode('utf-8') for line in stream)
+                for row in csv.reader(lines):
+                    total_size += int(row[size_column] or 0)
+                    object_count += 1
+        
+        logger.info(f"Read bucket size for {bucket_name} from inventory manifest {manifest_key}")
+        return total_size, object_count
+    except Exception as e:
+        logger.error(f"Error reading bucket inventory: {e}")
+        raise
+
+def calculate_bucket_size(bucket_name):
+    """
+    Calculate the total size and object count of the given S3 bucket by listing it.
+    
+    The first level of the keyspace is listed with a '/' delimiter, then each
+    common prefix is listed in its own thread so the pages are fetched in parallel.
+    """
+    try:
+        # Get total size of the objects at the top level and collect the prefixes below it
         total_size = 0
         object_count = 0
+        prefixes = []
         
-        # Paginate through all objects
         paginator = s3.get_paginator('list_objects_v2')
-        pages = paginator.paginate(Bucket=bucket_name)
+        pages = paginator.paginate(Bucket=bucket_name, Delimiter='/')
         
         for page in pages:
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    total_size += obj['Size']
-                    object_count += 1
+            contents = page.get('Contents', [])
+            total_size += sum(map(get_size, contents))
+            object_count += len(contents)
+            prefixes.extend(common['Prefix'] for common in page.get('CommonPrefixes', []))
         
-        # Get current timestamp
-        timestamp = datetime.datetime.now().isoformat()
+        if prefixes:
+            with ThreadPoolExecutor(max_workers=LIST_WORKERS) as executor:
+                results = executor.map(lambda prefix: sum_prefix(bucket_name, prefix), prefixes)
+                for prefix_size, prefix_count in results:
+                    total_size += prefix_size
+                    object_count += prefix_count
         
-        # Store data in DynamoDB
-        table = dynamodb.Table(TABLE_NAME)
-        response = table.put_item(
+        return total_size, object_count
+    except Exception as e:
+        logger.error(f"Error calculating bucket size: {e}")
+        raise
+
+def sum_prefix(bucket_name, prefix):
+    """
+    Sum the size and count of every object under the given prefix.
+    """
+    total_size = 0
+    object_count = 0
+    
+    # Paginate through all objects
+    paginator = s3.get_paginator('list_objects_v2')
+    pages = paginator.paginate(Bucket=bucket_name, Prefix=prefix)
+    
+    for page in pages:
+        contents = page.get('Contents', [])
+        total_size += sum(map(get_size, contents))
+        object_count += len(contents)
+    
+    return total_size, object_count
+
+def list_object_sizes(bucket_name):
+    """
+    List every object in the bucket, fanning out over the top-level prefixes
+    like calculate_bucket_size.
+    
+    Returns:
+        dict: Object key to size.
+    """
+    try:
+        object_sizes = {}
+        prefixes = []
+        
+        paginator = s3.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket_name, Delimiter='/'):
+            object_sizes.update((obj['Key'], obj['Size']) for obj in page.get('Contents', []))
+            prefixes.extend(common['Prefix'] for common in page.get('CommonPrefixes', []))
+        
+        if prefixes:
+            with ThreadPoolExecutor(max_workers=LIST_WORKERS) as executor:
+                for prefix_sizes in executor.map(lambda prefix: list_prefix(bucket_name, prefix), prefixes):
+                    object_sizes.update(prefix_sizes)
+        
+        return object_sizes
+    except Exception as e:
+        logger.error(f"Error listing bucket objects: {e}")
+        raise
+
+def list_prefix(bucket_name, prefix):
+    """
+    Map every object key under the given prefix to its size.
+    """
+    object_sizes = {}
+    
+    paginator = s3.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+        object_sizes.update((obj['Key'], obj['Size']) for obj in page.get('Contents', []))
+    
+    return object_sizes
+
+def store_bucket_size(bucket_name, total_size, object_count):
+    """
+    Store a timestamped bucket size snapshot in DynamoDB for plotting.
+    """
+    try:
+        # Fixed-width UTC timestamp, so sort key order matches time order
+        timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds')
+        
+        # Store data in DynamoDB; the item is already in wire format, so a plain
+        # low-level client (not the resource's, which still serializes) sends it as is
+        response = dynamodb_client.put_item(
+            TableName=TABLE_NAME,
             Item={
-                'bucketName': bucket_name,
-                'timestamp': timestamp,
-                'totalSize': total_size,
-                'objectCount': object_count
+                'bucketName': {'S': bucket_name},
+                'timestamp': {'S': timestamp},
+                'totalSize': {'N': str(total_size)},
+                'objectCount': {'N': str(object_count)}
             }
         )
         
         logger.info(f"Stored bucket size info - Bucket: {bucket_name}, Size: {total_size}, Count: {object_count}")
         return response
     except Exception as e:
-        logger.error(f"Error calculating or storing bucket size: {e}")
-        raise
\ No newline at end of file
+        logger.error(f"Error storing bucket size: {e}")
+        raise
@@ -0,0 +1,64 @@
+import importlib.util
+import os
+
+import boto3
+import pytest
+from moto import mock_aws
+
+BUCKET_NAME = "size-tracker-test-bucket"
+TABLE_NAME = "S3ObjectSizeHistory"
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "lambda")
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    """
+    Mocked bucket and size history table, shaped like the storage stack's.
+    """
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("TABLE_NAME", TABLE_NAME)
+    monkeypatch.setenv("BUCKET_NAME", BUCKET_NAME)
+
+    with mock_aws():
+        boto3.client("s3").create_bucket(Bucket=BUCKET_NAME)
+        boto3.client("dynamodb").create_table(
+            TableName=TABLE_NAME,
+            KeySchema=[
+                {"AttributeName": "bucketName", "KeyType": "HASH"},
+                {"AttributeName": "timestamp", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "bucketName", "AttributeType": "S"},
+                {"AttributeName": "timestamp", "AttributeType": "S"},
+                {"AttributeName": "size", "AttributeType": "N"},
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": "SizeIndex",
+                    "KeySchema": [
+                        {"AttributeName": "bucketName", "KeyType": "HASH"},
+                        {"AttributeName": "size", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {"ProjectionType": "INCLUDE", "NonKeyAttributes": ["objectKey"]},
+                }
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield
+
+
+@pytest.fixture
+def load_lambda(aws):
+    """
+    Import a handler module inside the mock so its module-level clients are mocked too.
+    """
+    def load(name):
+        path = os.path.join(LAMBDA_DIR, name, f"{name}_lambda.py")
+        spec = importlib.util.spec_from_file_location(f"{name}_lambda", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    return load
@@ -0,0 +1,42 @@
+import boto3
+
+from .conftest import BUCKET_NAME, TABLE_NAME
+
+
+def index_object(key, size):
+    boto3.resource("dynamodb").Table(TABLE_NAME).put_item(
+        Item={"bucketName": BUCKET_NAME, "timestamp": f"object#{key}", "objectKey": key, "size": size}
+    )
+
+
+def test_cleaner_deletes_largest_indexed_object_that_still_exists(load_lambda):
+    s3 = boto3.client("s3")
+    s3.put_object(Bucket=BUCKET_NAME, Key="small.txt", Body=b"x" * 5)
+    s3.put_object(Bucket=BUCKET_NAME, Key="large.txt", Body=b"x" * 20)
+    index_object("small.txt", 5)
+    index_object("large.txt", 20)
+    # A delete handled before its create leaves a row for an object that is gone
+    index_object("phantom.txt", 100)
+
+    cleaner = load_lambda("cleaner")
+    assert cleaner.find_largest_object(cleaner.bucket) == {"Key": "large.txt", "Size": 20}
+
+    cleaner.handler({}, None)
+    keys = [obj["Key"] for obj in s3.list_objects_v2(Bucket=BUCKET_NAME)["Contents"]]
+    assert keys == ["small.txt"]
+
+
+def test_cleaner_lists_the_bucket_when_the_index_is_empty(load_lambda):
+    s3 = boto3.client("s3")
+    s3.put_object(Bucket=BUCKET_NAME, Key="a.txt", Body=b"x" * 5)
+    s3.put_object(Bucket=BUCKET_NAME, Key="b.txt", Body=b"x" * 15)
+
+    cleaner = load_lambda("cleaner")
+    assert cleaner.find_largest_object(cleaner.bucket) == {"Key": "b.txt", "Size": 15}
+
+
+def test_cleaner_finds_nothing_in_an_empty_bucket(load_lambda):
+    index_object("phantom.txt", 100)
+
+    cleaner = load_lambda("cleaner")
+    assert cleaner.find_largest_object(cleaner.bucket) is None
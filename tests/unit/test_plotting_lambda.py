@@ -0,0 +1,26 @@
+import datetime
+import json
+
+import boto3
+
+from .conftest import BUCKET_NAME, TABLE_NAME
+
+
+def test_handler_plots_recent_sizes_against_max(load_lambda):
+    table = boto3.resource("dynamodb").Table(TABLE_NAME)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    for seconds_ago, total_size in [(3, 19), (2, 47), (1, 21)]:
+        timestamp = (now - datetime.timedelta(seconds=seconds_ago)).isoformat(timespec="milliseconds")
+        table.put_item(Item={"bucketName": BUCKET_NAME, "timestamp": timestamp, "totalSize": total_size})
+    table.put_item(Item={"bucketName": BUCKET_NAME, "timestamp": "MAX", "totalSize": 47})
+
+    plotting = load_lambda("plotting")
+    assert plotting.get_max_bucket_size(BUCKET_NAME) == 47
+
+    response = plotting.handler({}, None)
+    assert response["statusCode"] == 200
+    assert "plotUrl" in json.loads(response["body"])
+
+    plot = boto3.client("s3").get_object(Bucket=BUCKET_NAME, Key="plot")
+    assert plot["ContentType"] == "image/png"
+    assert plot["Body"].read().startswith(b"\x89PNG")
@@ -0,0 +1,201 @@
+import gzip
+import json
+
+import boto3
+import pytest
+
+from .conftest import BUCKET_NAME
+
+
+@pytest.fixture
+def size_tracking(load_lambda):
+    return load_lambda("size_tracking")
+
+
+def sqs_event(*s3_events):
+    return {
+        "Records": [
+            {"messageId": str(index), "body": json.dumps(s3_event)}
+            for index, s3_event in enumerate(s3_events)
+        ]
+    }
+
+
+def s3_event(detail_type, key, size=None):
+    s3_object = {"key": key}
+    if size is not None:
+        s3_object["size"] = size
+    return {
+        "source": "aws.s3",
+        "detail-type": detail_type,
+        "detail": {"bucket": {"name": BUCKET_NAME}, "object": s3_object},
+    }
+
+
+def get_row(module, sort_key):
+    return module.table.get_item(Key={"bucketName": BUCKET_NAME, "timestamp": sort_key}).get("Item")
+
+
+def test_handler_updates_totals_and_stores_snapshot(size_tracking):
+    s3 = boto3.client("s3")
+    s3.put_object(Bucket=BUCKET_NAME, Key="a.txt", Body=b"x" * 10)
+    s3.put_object(Bucket=BUCKET_NAME, Key="b.txt", Body=b"x" * 20)
+
+    # The first batch seeds the totals from a listing, which already includes both objects
+    result = size_tracking.handler(
+        sqs_event(s3_event("Object Created", "a.txt", 10), s3_event("Object Created", "b.txt", 20)),
+        None,
+    )
+    assert result == {"batchItemFailures": []}
+
+    current = get_row(size_tracking, "CURRENT")
+    assert (current["totalSize"], current["objectCount"]) == (30, 2)
+    assert get_row(size_tracking, "MAX")["totalSize"] == 30
+    assert get_row(size_tracking, "object#a.txt")["size"] == 10
+
+    snapshots = size_tracking.table.query(
+        KeyConditionExpression="bucketName = :b AND begins_with(#ts, :year)",
+        ExpressionAttributeNames={"#ts": "timestamp"},
+        ExpressionAttributeValues={":b": BUCKET_NAME, ":year": "2"},
+    )["Items"]
+    assert [item["totalSize"] for item in snapshots] == [30]
+
+    # Later batches move the totals by the net delta
+    s3.delete_object(Bucket=BUCKET_NAME, Key="b.txt")
+    result = size_tracking.handler(sqs_event(s3_event("Object Deleted", "b.txt")), None)
+    assert result == {"batchItemFailures": []}
+
+    current = get_row(size_tracking, "CURRENT")
+    assert (current["totalSize"], current["objectCount"]) == (10, 1)
+    assert get_row(size_tracking, "MAX")["totalSize"] == 30
+    assert get_row(size_tracking, "object#b.txt") is None
+
+
+def test_handler_ignores_invocations_without_records(size_tracking):
+    assert size_tracking.handler({}, None) == {"batchItemFailures": []}
+
+
+def test_cloudwatch_source_falls_back_to_listing_without_metrics(size_tracking, monkeypatch):
+    boto3.client("s3").put_object(Bucket=BUCKET_NAME, Key="a.txt", Body=b"x" * 10)
+    # A bucket younger than a day has no daily storage metrics yet
+    monkeypatch.setattr(
+        size_tracking.cloudwatch, "get_metric_statistics", lambda **kwargs: {"Datapoints": []}
+    )
+
+    assert size_tracking.get_size_from_cloudwatch(BUCKET_NAME) == (10, 1)
+
+
+def test_inventory_source_reads_only_this_buckets_report(size_tracking):
+    s3 = boto3.client("s3")
+    s3.create_bucket(Bucket="inventory")
+
+    def put_report(source_bucket, sizes):
+        report = "\n".join(f'"{source_bucket}","key{index}","{size}"' for index, size in enumerate(sizes))
+        data_key = f"reports/{source_bucket}/daily/data/{source_bucket}.csv.gz"
+        s3.put_object(Bucket="inventory", Key=data_key, Body=gzip.compress(report.encode()))
+        manifest = {
+            "sourceBucket": source_bucket,
+            "fileFormat": "CSV",
+            "fileSchema": "Bucket, Key, Size",
+            "files": [{"key": data_key}],
+        }
+        s3.put_object(
+            Bucket="inventory",
+            Key=f"reports/{source_bucket}/daily/2026-10-15T01-00Z/manifest.json",
+            Body=json.dumps(manifest).encode(),
+        )
+
+    put_report(BUCKET_NAME, [5, 10, 15])
+    put_report(f"{BUCKET_NAME}-other", [1000] * 7)
+
+    assert size_tracking.get_size_from_inventory(BUCKET_NAME, "inventory", "reports") == (30, 3)
+
+    with pytest.raises(ValueError):
+        size_tracking.get_size_from_inventory(BUCKET_NAME, None, "reports")
+
+
+def test_reconcile_resyncs_totals_and_size_index(size_tracking):
+    s3 = boto3.client("s3")
+    s3.put_object(Bucket=BUCKET_NAME, Key="a.txt", Body=b"x" * 10)
+    s3.put_object(Bucket=BUCKET_NAME, Key="dir/b.txt", Body=b"x" * 20)
+
+    # a.txt has a stale size, dir/b.txt was never indexed and gone.txt no longer exists
+    for key, size in [("a.txt", 5), ("gone.txt", 99)]:
+        size_tracking.table.put_item(
+            Item={"bucketName": BUCKET_NAME, "timestamp": f"object#{key}", "objectKey": key, "size": size}
+        )
+
+    assert size_tracking.reconcile_handler({}, None) == {"totalSize": 30, "objectCount": 2}
+
+    current = get_row(size_tracking, "CURRENT")
+    assert (current["totalSize"], current["objectCount"]) == (30, 2)
+    assert size_tracking.get_indexed_object_sizes(BUCKET_NAME) == {
+        "object#a.txt": 10,
+        "object#dir/b.txt": 20,
+    }
+
+
+def test_redelivered_batch_applies_its_delta_once(size_tracking, monkeypatch):
+    s3 = boto3.client("s3")
+    s3.put_object(Bucket=BUCKET_NAME, Key="a.txt", Body=b"x" * 10)
+    size_tracking.handler(sqs_event(s3_event("Object Created", "a.txt", 10)), None)
+
+    # The first delivery fails after the transaction, the second one is a clean retry
+    event = sqs_event(s3_event("Object Created", "b.txt", 20))
+    store_bucket_size = size_tracking.store_bucket_size
+
+    def fail_once(*args):
+        monkeypatch.setattr(size_tracking, "store_bucket_size", store_bucket_size)
+        raise RuntimeError("throttled")
+
+    monkeypatch.setattr(size_tracking, "store_bucket_size", fail_once)
+    assert size_tracking.handler(event, None) == {"batchItemFailures": [{"itemIdentifier": "0"}]}
+    assert size_tracking.handler(event, None) == {"batchItemFailures": []}
+
+    current = get_row(size_tracking, "CURRENT")
+    assert (current["totalSize"], current["objectCount"]) == (30, 2)
+
+
+def test_failed_transaction_leaves_rows_and_totals_untouched(size_tracking, monkeypatch):
+    s3 = boto3.client("s3")
+    s3.put_object(Bucket=BUCKET_NAME, Key="a.txt", Body=b"x" * 10)
+    size_tracking.handler(sqs_event(s3_event("Object Created", "a.txt", 10)), None)
+
+    client = size_tracking.dynamodb.meta.client
+    transact_write_items = client.transact_write_items
+
+    def fail_once(**kwargs):
+        monkeypatch.setattr(client, "transact_write_items", transact_write_items)
+        raise RuntimeError("throttled")
+
+    monkeypatch.setattr(client, "transact_write_items", fail_once)
+    event = sqs_event(s3_event("Object Created", "b.txt", 20), s3_event("Object Deleted", "a.txt"))
+    assert len(size_tracking.handler(event, None)["batchItemFailures"]) == 2
+    assert get_row(size_tracking, "object#b.txt") is None
+
+    assert size_tracking.handler(event, None) == {"batchItemFailures": []}
+    current = get_row(size_tracking, "CURRENT")
+    assert (current["totalSize"], current["objectCount"]) == (20, 1)
+    assert get_row(size_tracking, "object#a.txt") is None
+
+
+def test_handler_reuses_module_level_table(size_tracking, monkeypatch):
+    s3 = boto3.client("s3")
+    table = size_tracking.table
+
+    def fail_table(name):
+        raise AssertionError(f"handler built a new Table for {name}")
+
+    monkeypatch.setattr(size_tracking.dynamodb, "Table", fail_table)
+
+    s3.put_object(Bucket=BUCKET_NAME, Key="a.txt", Body=b"x" * 10)
+    assert size_tracking.handler(sqs_event(s3_event("Object Created", "a.txt", 10)), None) == {
+        "batchItemFailures": []
+    }
+    s3.put_object(Bucket=BUCKET_NAME, Key="b.txt", Body=b"x" * 20)
+    assert size_tracking.handler(sqs_event(s3_event("Object Created", "b.txt", 20)), None) == {
+        "batchItemFailures": []
+    }
+
+    assert size_tracking.table is table
+    assert get_row(size_tracking, "CURRENT")["totalSize"] == 30